@@ -21,3 +21,7 @@ SAP_LOGIN = "SAP Ejendomsbeskatning"
 GO_API = "https://ad.go.aarhuskommune.dk"
 GO_CREDENTIALS = "GetOrganized Login"
 GO_TIMEOUT = 60
+
+# Email tasks
+TASK_MAIL_SENDER = "noreply@aarhus.dk"
+TASK_MAIL_SUBJECT = "Forespørgsler til Ejendomsbeskatning"
@@ -10,13 +10,18 @@ from itk_dev_shared_components.sap import multi_session
 from itk_dev_shared_components.graph import authentication as graph_authentication
 from itk_dev_shared_components.graph.authentication import GraphAccess
 from itk_dev_shared_components.graph import mail as graph_mail
-from bs4 import BeautifulSoup
+from lxml import etree
+import lxml.html
 import itk_dev_event_log
 
 from robot_framework import config
 from robot_framework.sub_process import structura_process, sap_process, mail_process, go_process, doc2archive_process
 from robot_framework.sub_process.sqlite_process import DocDatabase
 
+# The form fields are <p> elements and the owners are the items of the first <ul>
+_FORM_FIELDS = etree.XPath("//p")
+_OWNER_ITEMS = etree.XPath("(//ul)[1]//li")
+
 
 def process(orchestrator_connection: OrchestratorConnection) -> None:
     """Do the primary process of the robot."""
@@ -45,6 +50,9 @@ def process(orchestrator_connection: OrchestratorConnection) -> None:
     # Initialize GO session
     go_creds = orchestrator_connection.get_credential(config.GO_CREDENTIALS)
     go_session = go_process.create_session(go_creds.username, go_creds.password)
+    go_cases = {}
+    property_searches = {}
+    property_lookups = {}
 
     for task in tasks:
         handle_task(
@@ -52,6 +60,9 @@ def process(orchestrator_connection: OrchestratorConnection) -> None:
             receivers=receivers,
             orchestrator_connection=orchestrator_connection,
             go_session=go_session,
+            go_cases=go_cases,
+            property_searches=property_searches,
+            property_lookups=property_lookups,
             sap_session=sap_session,
             graph_access=graph_access,
             doc_database=doc_database
@@ -68,7 +79,8 @@ class Task:
     mail: graph_mail.Email
 
 
-def handle_task(*, task: Task, receivers: list[str], orchestrator_connection: OrchestratorConnection, go_session, sap_session,
+def handle_task(*, task: Task, receivers: list[str], orchestrator_connection: OrchestratorConnection, go_session, go_cases: dict[str, str],
+                property_searches: dict[str, list[structura_process.Property]], property_lookups: dict[tuple, tuple], sap_session,
                 graph_access: GraphAccess, doc_database: DocDatabase):
     """Handle a single task from start to finish.
 
@@ -77,12 +89,17 @@ def handle_task(*, task: Task, receivers: list[str], orchestrator_connection: Or
         receivers: The list of email receivers.
         orchestrator_connection: The connection to Orchestrator.
         go_session: The GO session.
+        go_cases: GO case ids found or created during this run, keyed by address.
+        property_searches: Structura property searches done during this run, keyed by address.
+        property_lookups: Structura and SAP lookups done during this run, keyed by property number and requested owners.
         sap_session: The SAP session.
         graph_access: The GraphAccess object.
         doc_database: The DocDatabase object.
     """
     orchestrator_connection.log_info(f"Searching info on {task.address}")
-    properties = structura_process.find_property(task.address)
+    if task.address not in property_searches:
+        property_searches[task.address] = structura_process.find_property(task.address)
+    properties = property_searches[task.address]
     orchestrator_connection.log_error(f"Properties found: {len(properties)}")
 
     if not properties:
@@ -95,15 +112,20 @@ def handle_task(*, task: Task, receivers: list[str], orchestrator_connection: Or
 
     for property_ in properties:
         orchestrator_connection.log_info(f"Searching on property {property_.property_number}")
-        owners = structura_process.get_owners(property_.property_number, task.owners)
-        owner_cprs = [p[0] for p in owners]
+        lookup_key = (property_.property_number, tuple(task.owners))
+        if lookup_key not in property_lookups:
+            owners = structura_process.get_owners(property_.property_number, task.owners)
+            owner_cprs = [p[0] for p in owners]
+
+            frozen_debt = structura_process.get_frozen_debt(property_.property_number, owner_cprs)
+            if structura_process.should_skip_due_to_frozen_debt(frozen_debt):
+                return
 
-        frozen_debt = structura_process.get_frozen_debt(property_.property_number, owner_cprs)
-        if structura_process.should_skip_due_to_frozen_debt(frozen_debt):
-            return
+            tax_data = structura_process.get_tax_data(property_.property_number)
+            missing_payments = [sap_process.get_property_debt(sap_session, cpr, name, property_.property_number) for cpr, name in owners]
+            property_lookups[lookup_key] = (owners, frozen_debt, tax_data, missing_payments)
 
-        tax_data = structura_process.get_tax_data(property_.property_number)
-        missing_payments = [sap_process.get_property_debt(sap_session, cpr, name, property_.property_number) for cpr, name in owners]
+        owners, frozen_debt, tax_data, missing_payments = property_lookups[lookup_key]
         tax_adjustments = doc_database.search_property(property_.property_number)
 
         # Format results as two html divs
@@ -129,12 +151,13 @@ def handle_task(*, task: Task, receivers: list[str], orchestrator_connection: Or
         html_div_list.append(html_div)
 
     # Find/Create GO case and upload incoming request
-    go_case_id = go_process.find_case(task.address, go_session)
+    go_case_id = go_cases.get(task.address) or go_process.find_case(task.address, go_session)
     if not go_case_id:
         case_title = f"{task.address}, {' - '.join(p.property_number for p in properties)}"
         go_case_id = go_process.create_case(go_session, case_title)
+    go_cases[task.address] = go_case_id
 
-    go_process.upload_document(session=go_session, file=graph_mail.get_email_as_mime(task.mail, graph_access).getvalue(), case=go_case_id, filename=f"Forespørgsel {task.address} {date.today()}.eml")
+    go_process.upload_document(session=go_session, file=graph_mail.get_email_as_mime(task.mail, graph_access).getbuffer(), case=go_case_id, filename=f"Forespørgsel {task.address} {date.today()}.eml")
     orchestrator_connection.log_info(f"GO case created: {go_case_id}")
 
     # Join all result html divs and send as email
@@ -143,7 +166,7 @@ def handle_task(*, task: Task, receivers: list[str], orchestrator_connection: Or
     orchestrator_connection.log_info("Email sent")
 
     # Upload mail to GO
-    go_process.upload_document(session=go_session, file=bytearray(html_body, encoding="utf-8"), case=go_case_id, filename=f"Email fra RPA - Ejendomsoplysning {task.address} {date.today()}.html")
+    go_process.upload_document(session=go_session, file=html_body.encode("utf-8"), case=go_case_id, filename=f"Email fra RPA - Ejendomsoplysning {task.address} {date.today()}.html")
 
     # Delete task from mail queue
     graph_mail.delete_email(task.mail, graph_access)
@@ -159,15 +182,17 @@ def get_email_tasks(graph_access: GraphAccess) -> list[Task]:
         A list of Task object based on the found emails.
     """
     mails = graph_mail.get_emails_from_folder("itk-rpa@mkb.aarhus.dk", "Indbakke/Ejendomsbeskatning", graph_access)
-    mails = [mail for mail in mails if mail.sender == 'noreply@aarhus.dk' and 'Forespørgsler til Ejendomsbeskatning' in mail.subject]
-    mails.reverse()
+    mails = (mail for mail in reversed(mails) if mail.sender == config.TASK_MAIL_SENDER and config.TASK_MAIL_SUBJECT in mail.subject)
 
     tasks = []
 
     for mail in mails:
-        soup = BeautifulSoup(mail.body, "html.parser")
-        paragraphs = [p.get_text(separator="$").split('$') for p in soup.find_all('p')]
-        values = {p[0]: p[1] for p in paragraphs if len(p) == 2}
+        root = lxml.html.fromstring(mail.body)
+        values = {}
+        for p in _FORM_FIELDS(root):
+            texts = _get_texts(p)
+            if len(texts) == 2:
+                values[texts[0]] = texts[1]
 
         if values["Jeg kan ikke finde adressen i udsøgningen"] == "Valgt":
             graph_mail.delete_email(mail, graph_access)
@@ -176,11 +201,9 @@ def get_email_tasks(graph_access: GraphAccess) -> list[Task]:
         address = values["Indtast sagens adresse"]
 
         if values["Drejer sagen sig om privatpersoner eller virksomhed?"] == "Privatpersoner":
-            name_list = soup.find("ul")
-            names = [li.get_text(separator="$").split('$') for li in name_list.find_all('li')]
             names = [
-                " ".join([item.split(":")[1].strip() for item in name])
-                for name in names
+                " ".join(item.split(":")[1].strip() for item in _get_texts(li))
+                for li in _OWNER_ITEMS(root)
             ]
         else:
             names = [values["Indtast virksomhedens navn"]]
@@ -192,6 +215,13 @@ def get_email_tasks(graph_access: GraphAccess) -> list[Task]:
     return tasks
 
 
+def _get_texts(element: lxml.html.HtmlElement) -> list[str]:
+    """Get the text fragments of an html element with surrounding whitespace removed.
+    Empty fragments and fragments that only contain whitespace are skipped.
+    """
+    return [text.strip() for text in element.itertext() if text.strip()]
+
+
 if __name__ == '__main__':
     conn_string = os.getenv("OpenOrchestratorConnString")
     crypto_key = os.getenv("OpenOrchestratorKey")
@@ -1,6 +1,8 @@
 """This module handled integrations to KMD Doc2Arhcive."""
 
 import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import uuid
 import os
@@ -16,6 +18,9 @@ from OpenOrchestrator.orchestrator_connection.connection import OrchestratorConn
 
 from robot_framework.sub_process.sqlite_process import DocDatabase
 
+# Matches the numbers in the report tables, e.g. '12345', '1.234,56' and '-1.234,56'
+_NUMBER_PATTERN = re.compile(r"-?[\d\.]+(?:,\d\d)?")
+
 
 def open_doc2archive():
     """Start doc2archive and choose the correct folder to open.
@@ -51,6 +56,9 @@ def extract_page_values(page: pypdf.PageObject) -> list[list[str]]:
     Args:
         page: The pypdf page object to read.
 
+    Raises:
+        ValueError: If the table on the page couldn't be read correctly.
+
     Returns:
         A 2d list of the table data.
     """
@@ -58,12 +66,12 @@ def extract_page_values(page: pypdf.PageObject) -> list[list[str]]:
     t = page.extract_text()
     t = t.split("Kommunal ejd.")[1]
     t = t.split("-------")[0]
-    v = re.findall(r"-?[\d\.]+(?:,\d\d)?", t)
+    v = _NUMBER_PATTERN.findall(t)
 
     # Make sure that the correct number of columns are read
-    assert len(v) % 7 == 0
-    # Make sure everything except spaces is read
-    assert (len(t) - sum(len(s) for s in v)) == t.count(" ")
+    # and that everything except spaces is read
+    if len(v) % 7 != 0 or (len(t) - sum(len(s) for s in v)) != t.count(" "):
+        raise ValueError("The report table couldn't be read correctly.")
 
     # Split into rows
     for i in range(0, len(v), 7):
@@ -72,24 +80,20 @@ def extract_page_values(page: pypdf.PageObject) -> list[list[str]]:
     return result
 
 
-def extract_pdf_values(pdf_path: str) -> list[list[str]]:
+def extract_pdf_values(pdf_path: str) -> Iterator[list[str]]:
     """Extract data from all pages of the given pdf.
+    The rows are yielded one page at a time.
 
     Args:
         pdf_path: The path to the pdf file.
 
-    Returns:
-        A 2d list of the table data from all pages combined.
+    Yields:
+        The rows of the table data from all pages combined.
     """
     pdf_reader = pypdf.PdfReader(pdf_path)
 
-    result = []
-
     for p in pdf_reader.pages:
-        page_values = extract_page_values(p)
-        result.extend(page_values)
-
-    return result
+        yield from extract_page_values(p)
 
 
 def read_document_list() -> list[DocumentMetaData]:
@@ -104,8 +108,7 @@ def read_document_list() -> list[DocumentMetaData]:
 
     # Select entire table (max 300 rows)
     uiautomation.PressKey(Keys.VK_SHIFT)
-    for _ in range(300):
-        table.SendKey(Keys.VK_DOWN, waitTime=0)
+    _press_down(300)
     uiautomation.ReleaseKey(Keys.VK_SHIFT)
 
     clear_clipboard()
@@ -124,20 +127,28 @@ def get_clipboard_text() -> str:
     Returns:
         The text currently on the clipboard.
     """
-    win32clipboard.OpenClipboard()
-    if win32clipboard.IsClipboardFormatAvailable(win32clipboard.CF_TEXT):
-        data = win32clipboard.GetClipboardData()
-    else:
-        data = ""
-    win32clipboard.CloseClipboard()
-    return data
+    with _open_clipboard():
+        if win32clipboard.IsClipboardFormatAvailable(win32clipboard.CF_TEXT):
+            return win32clipboard.GetClipboardData()
+        return ""
 
 
 def clear_clipboard():
     """Clear the clipboard."""
+    with _open_clipboard():
+        win32clipboard.EmptyClipboard()
+
+
+@contextmanager
+def _open_clipboard():
+    """Open the clipboard and make sure it's closed again,
+    so other applications aren't locked out of it if an error occurs.
+    """
     win32clipboard.OpenClipboard()
-    win32clipboard.EmptyClipboard()
-    win32clipboard.CloseClipboard()
+    try:
+        yield
+    finally:
+        win32clipboard.CloseClipboard()
 
 
 def parse_document_data(data_str: str) -> DocumentMetaData:
@@ -207,8 +218,16 @@ def scroll_to_document(document_index: int):
     doc2arcive = uiautomation.WindowControl(Name="KMD doc2archive", searchDepth=1)
     table = doc2arcive.PaneControl(AutomationId="table")
     table.SendKey(Keys.VK_HOME)
-    for _ in range(document_index):
-        table.SendKey(Keys.VK_DOWN, waitTime=0)
+    _press_down(document_index)
+
+
+def _press_down(count: int):
+    """Press the down key the given number of times.
+    The table must already have focus, e.g. from a key press sent to it,
+    so it isn't refocused on each key press.
+    """
+    for _ in range(count):
+        uiautomation.SendKey(Keys.VK_DOWN, waitTime=0)
 
 
 def search_for_documents(days: int) -> list[DocumentMetaData]:
@@ -230,7 +249,7 @@ def search_for_documents(days: int) -> list[DocumentMetaData]:
     doc2arcive.ButtonControl(AutomationId="SoegButton").Click(simulateMove=False)
 
     popup = doc2arcive.WindowControl(Name="KMD doc2archive", searchDepth=1)
-    if popup.Exists():
+    if popup.Exists(maxSearchSeconds=2):
         if popup.TextControl().Name != "Ingen dokumenter opfylder søgekriterierne.":
             raise RuntimeError("Unknown popup shown.")
 
@@ -253,7 +272,6 @@ def update_doc_database(doc_database: DocDatabase, orchestrator_connection: Orch
     for i, doc in enumerate(documents):
         if doc.report_type == "EAENDR" and not doc_database.is_report_in_database(doc.report_date, doc.tax_year):
             path = save_document(doc, i)
-            table_data = extract_pdf_values(path)
-            property_list = [row[0] for row in table_data]
+            property_list = [row[0] for row in extract_pdf_values(path)]
             doc_database.add_report_data(doc.report_date, doc.tax_year, property_list)
             orchestrator_connection.log_info(f"Added report to doc database: {doc.report_date} - {doc.tax_year} - {len(property_list)}")
@@ -1,12 +1,23 @@
 """Functions for working with the GetOrganized API."""
 
-import json
 from urllib.parse import urljoin
+from xml.sax.saxutils import escape
 
+import orjson
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests_ntlm import HttpNtlmAuth
+from urllib3.util import Retry
 from robot_framework import config
 
+_CREATE_CASE_URL = urljoin(config.GO_API, "/_goapi/Cases/")
+_ADD_DOCUMENT_URL = urljoin(config.GO_API, "/_goapi/Documents/AddToCase")
+_FIND_CASES_URL = urljoin(config.GO_API, "/_goapi/Cases/FindByCaseProperties")
+_CASE_SITE_URL = urljoin(config.GO_API, "/cases/EMN/")
+
+_CASE_METADATA = '<z:row xmlns:z="#RowsetSchema" ows_Title="{title}" ows_CaseStatus="Åben" ows_CaseCategory="Åben for alle" ows_Afdeling="916;#Backoffice - Drift og Økonomi" ows_KLENummer="318;#25.02.00 Ejendomsbeskatning i almindelighed"/>'
+_DOCUMENT_METADATA = "<z:row xmlns:z='#RowsetSchema' ows_Dato='{date}' ows_Kategori='{category}'/>"
+
 
 def create_session(username: str, password: str) -> Session:
     """Create a session for accessing GetOrganized API.
@@ -21,6 +32,8 @@ def create_session(username: str, password: str) -> Session:
     session = Session()
     session.headers.setdefault("Content-Type", "application/json")
     session.auth = HttpNtlmAuth(username, password)
+    # Only retry failed connections. Requests that reached GO are not resent since they aren't idempotent.
+    session.mount("https://", HTTPAdapter(max_retries=Retry(total=3, connect=3, read=False, status=False, other=0, backoff_factor=0.2)))
     return session
 
 
@@ -34,23 +47,22 @@ def create_case(session: Session, title: str) -> str:
     Returns:
         Return the CaseID of the created case.
     """
-    url = urljoin(config.GO_API, "/_goapi/Cases/")
     payload = {
         'CaseTypePrefix': "GEO",
-        'MetadataXml': f'<z:row xmlns:z="#RowsetSchema" ows_Title="{title}" ows_CaseStatus="Åben" ows_CaseCategory="Åben for alle" ows_Afdeling="916;#Backoffice - Drift og Økonomi" ows_KLENummer="318;#25.02.00 Ejendomsbeskatning i almindelighed"/>',
+        'MetadataXml': _CASE_METADATA.format(title=escape(title, {'"': "&quot;"})),
         'ReturnWhenCaseFullyCreated': False
     }
-    response = session.post(url, data=json.dumps(payload), timeout=config.GO_TIMEOUT)
+    response = session.post(_CREATE_CASE_URL, data=orjson.dumps(payload), timeout=config.GO_TIMEOUT)
     response.raise_for_status()
     return response.json()['CaseID']
 
 
-def upload_document(*, file: bytearray, case: str, filename: str, agent_name: str | None = None, date_string: str | None = None, session: Session, doc_category: str | None = None) -> str:
+def upload_document(*, file: bytes | memoryview, case: str, filename: str, agent_name: str | None = None, date_string: str | None = None, session: Session, doc_category: str | None = None) -> str:
     """Upload a document to Get Organized.
 
     Args:
         session: Session token for request.
-        file: Bytearray of file to upload.
+        file: Bytes of file to upload.
         case: Case name already present in GO.
         filename: Name of file when saved in GO.
         agent_name: Agent name, used for creating a folder in GO. Defaults to None.
@@ -59,18 +71,17 @@ def upload_document(*, file: bytearray, case: str, filename: str, agent_name: st
     Returns:
         Return response text and session token.
     """
-    url = config.GO_API + "/_goapi/Documents/AddToCase"
     payload = {
         "Bytes": list(file),
         "CaseId": case,
-        "SiteUrl": urljoin(config.GO_API, f"/cases/EMN/{case}"),
+        "SiteUrl": _CASE_SITE_URL + case,
         "ListName": "Dokumenter",
         "FolderPath": agent_name,
         "FileName": filename,
-        "Metadata": f"<z:row xmlns:z='#RowsetSchema' ows_Dato='{date_string}' ows_Kategori='{doc_category}'/>",
+        "Metadata": _DOCUMENT_METADATA.format(date=date_string, category=doc_category),
         "Overwrite": True
     }
-    response = session.post(url, data=json.dumps(payload), timeout=config.GO_TIMEOUT)
+    response = session.post(_ADD_DOCUMENT_URL, data=orjson.dumps(payload), timeout=config.GO_TIMEOUT)
     response.raise_for_status()
     return response.text
 
@@ -89,7 +100,6 @@ def find_case(case_title: str, session: Session) -> str | None:
     Returns:
         The case id of the found case if any.
     """
-    url = config.GO_API + "/_goapi/Cases/FindByCaseProperties"
     payload = {
         "FieldProperties": [
             {
@@ -108,7 +118,7 @@ def find_case(case_title: str, session: Session) -> str | None:
         "ExcludeDeletedCases": True,
         "ReturnCasesNumber": 2
     }
-    response = session.post(url, data=json.dumps(payload), timeout=config.GO_TIMEOUT)
+    response = session.post(_FIND_CASES_URL, data=orjson.dumps(payload), timeout=config.GO_TIMEOUT)
     response.raise_for_status()
     cases = response.json()['CasesInfo']
 
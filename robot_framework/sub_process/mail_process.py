@@ -71,7 +71,7 @@ def _create_list(content: list) -> Element:
     """
     result = []
     for v in content:
-        if type(v) in (tuple, list):
+        if isinstance(v, (tuple, list)):
             s = " | ".join(v)
         else:
             s = str(v)
@@ -82,9 +82,8 @@ def _create_list(content: list) -> Element:
 def _format_frozen_debt(frozen_debt: list[FrozenDebt]) -> Element:
     """Helper function for creating a list of frozen debt."""
     if not frozen_debt:
-        return _create_list(["Ingen poster"])
-    frozen_debt_list = [[f.cpr, f.name, f.date_, f.amount, f.status] for f in frozen_debt]
-    return _create_list(frozen_debt_list)
+        return ul[li["Ingen poster"]]
+    return ul[(li[f"{f.cpr} | {f.name} | {f.date_} | {f.amount} | {f.status}"] for f in frozen_debt)]
 
 
 def _format_missing_payments(missing_payments: list[MissingPaymentPerson]) -> Element:
@@ -104,7 +103,7 @@ def _format_missing_payments(missing_payments: list[MissingPaymentPerson]) -> El
                     (
                         li[
                             c.title,
-                            _create_list(c.entries) if c.entries else _create_list(["Ingen poster"]),
+                            ul[(li[str(e)] for e in c.entries) if c.entries else li["Ingen poster"]],
                         ]
                         for c in p.cases)
                 ]
@@ -116,8 +115,7 @@ def _format_missing_payments(missing_payments: list[MissingPaymentPerson]) -> El
 def _format_tax_adjustments(tax_adjustments: list[dict[str, str]]) -> Element:
     """Helper function for creating a list of tax adjustments."""
     if tax_adjustments:
-        adjustment_list = [[ta["property_number"], ta["tax_year"], ta["report_date"]] for ta in tax_adjustments]
-        return _create_list(adjustment_list)
+        return ul[(li[f"{ta['property_number']} | {ta['tax_year']} | {ta['report_date']}"] for ta in tax_adjustments)]
 
     return p["Ingen justeringer i databasen."]
 
@@ -246,16 +244,11 @@ def pretty_template(*, address: str, frozen_debt: list[FrozenDebt], missing_paym
         text = p["Der har pt. ikke været en efterregulering pba. af en 2020-vurdering."]
     else:
         # Group adjustments by report date
-        reports = {}
+        reports = defaultdict(list)
         for ta in tax_adjustments:
-            report_date = _format_report_date(ta["report_date"])
-            tax_year = ta['tax_year']
-            if report_date not in reports:
-                reports[report_date] = []
-            reports[report_date].append(tax_year)
-            reports[report_date].sort()
+            reports[_format_report_date(ta["report_date"])].append(ta['tax_year'])
 
-        text = [p[f"Der er d. {report_date} oprettet nye skattebilletter for skatteåret {', '.join(tax_years)} pba. en ny vurdering. De blev sendt til daværende ejer(e)."] for report_date, tax_years in reports.items()]
+        text = [p[f"Der er d. {report_date} oprettet nye skattebilletter for skatteåret {', '.join(sorted(tax_years))} pba. en ny vurdering. De blev sendt til daværende ejer(e)."] for report_date, tax_years in reports.items()]
 
     div_tax_adjustments = div[
         h3[f"Efterreguleringer af ejendomsskat for {address}"],
@@ -291,7 +284,7 @@ def pretty_template(*, address: str, frozen_debt: list[FrozenDebt], missing_paym
 
 def _format_report_date(report_date: str) -> str:
     """Change a date string from 'yyyy-mm-dd' to 'dd/mm yyyy'."""
-    return f"{report_date[8:12]}/{report_date[5:7]} {report_date[0:4]}"
+    return f"{report_date[8:10]}/{report_date[5:7]} {report_date[0:4]}"
 
 
 def _merge_missing_payments(missing_payments: list[MissingPaymentPerson]) -> list[str]:
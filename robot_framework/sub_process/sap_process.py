@@ -4,8 +4,11 @@ from dataclasses import dataclass, field
 
 from itk_dev_shared_components.sap import fmcacov, gridview_util
 
+# Converts amounts like "1.234,56-" to "1234.56" for float parsing
+_AMOUNT_TABLE = str.maketrans({".": "", ",": ".", "-": ""})
 
-@dataclass
+
+@dataclass(slots=True)
 class MissingPaymentEntry:
     """A dataclass representing a single entry in a case."""
     title: str
@@ -16,26 +19,30 @@ class MissingPaymentEntry:
         return f"{self.title} | {self.status} | {self.amount:.2f} kr"
 
 
-@dataclass
+@dataclass(slots=True)
 class MissingPaymentCase:
     """A dataclass representing a case with multiple entries."""
     title: str
     entries: list[MissingPaymentEntry] = field(default_factory=list)
+    # Entries by title and status for merging in append_entry
+    _entry_index: dict[tuple[str, str], MissingPaymentEntry] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def append_entry(self, new_entry: MissingPaymentEntry):
         """Append an entry to the case. If an entry with the same
         title and status already exists, add their amounts and only
         keep one.
         """
-        for old_entry in self.entries:
-            if old_entry.title == new_entry.title and old_entry.status == new_entry.status:
-                old_entry.amount += new_entry.amount
-                return
+        key = (new_entry.title, new_entry.status)
+        old_entry = self._entry_index.get(key)
+        if old_entry is not None:
+            old_entry.amount += new_entry.amount
+            return
 
+        self._entry_index[key] = new_entry
         self.entries.append(new_entry)
 
 
-@dataclass
+@dataclass(slots=True)
 class MissingPaymentPerson:
     """A dataclass representing a person with multiple cases."""
     name: str
@@ -126,8 +133,5 @@ def _convert_str_to_float(amount: str) -> float:
     Returns:
         The amount as a float value
     """
-    s = amount.replace(".", "").replace(",", ".")
-    sign = -1 if s.endswith("-") else 1
-    s = s.replace("-", "")
-
-    return float(s) * sign
+    value = float(amount.translate(_AMOUNT_TABLE))
+    return -value if amount.endswith("-") else value
@@ -1,16 +1,19 @@
 """This module is responsible for the Doc2Archive Sqlite database."""
 import sqlite3
+from collections.abc import Iterable
 
 
 class DocDatabase:
     """A proxy class for the database."""
     def __init__(self, database_path: str):
         self.database_path = database_path
+        self._connection = sqlite3.connect(database_path)
+        self._search_results: dict[str, list[dict[str, str]]] = {}
         self._create_tables()
 
     def _create_tables(self):
         """Create the needed database tables if the don't exist."""
-        connection = sqlite3.connect(self.database_path)
+        connection = self._connection
 
         connection.execute(
             """
@@ -38,44 +41,49 @@ class DocDatabase:
             """
         )
 
+        connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS report_date_index ON reports (report_date, tax_year)
+            """
+        )
+
         connection.commit()
 
-    def add_report_data(self, report_date: str, tax_year: str, property_list: list[str]):
+    def add_report_data(self, report_date: str, tax_year: str, property_list: Iterable[str]):
         """Add new report data to the database.
+        The report and all of its properties are added in a single transaction.
 
         Args:
             report_date: The date of the report.
             tax_year: The tax year of the report.
-            property_list: The list of properties in the report table.
+            property_list: The properties in the report table.
         """
-        connection = sqlite3.connect(self.database_path)
+        connection = self._connection
 
-        cursor = connection.cursor()
-
-        cursor.execute(
-            """
-            INSERT INTO reports
-            (report_date, tax_year)
-            VALUES
-            (?, ?)
-            """,
-            (report_date, tax_year)
-        )
+        with connection:
+            cursor = connection.execute(
+                """
+                INSERT INTO reports
+                (report_date, tax_year)
+                VALUES
+                (?, ?)
+                """,
+                (report_date, tax_year)
+            )
 
-        report_id = cursor.lastrowid
+            report_id = cursor.lastrowid
 
-        for property_ in property_list:
-            cursor.execute(
+            connection.executemany(
                 """
                 INSERT INTO properties
                 (property_number, report_id)
                 VALUES
                 (?, ?)
                 """,
-                (property_, report_id)
+                ((property_, report_id) for property_ in property_list)
             )
 
-        connection.commit()
+        self._search_results.clear()
 
     def is_report_in_database(self, report_date: str, tax_year: str) -> bool:
         """Check if a given report is already stored in the database.
@@ -87,10 +95,8 @@ class DocDatabase:
         Returns:
             True if the report is in the database.
         """
-        connection = sqlite3.connect(self.database_path)
-
-        cursor = connection.execute("SELECT * FROM reports WHERE report_date = ? AND tax_year = ?", (report_date, tax_year))
-        return len(cursor.fetchall()) > 0
+        cursor = self._connection.execute("SELECT 1 FROM reports WHERE report_date = ? AND tax_year = ? LIMIT 1", (report_date, tax_year))
+        return cursor.fetchone() is not None
 
     def search_property(self, property_number: str) -> list[dict[str, str]]:
         """Search for a property number in the doc database.
@@ -101,21 +107,18 @@ class DocDatabase:
         Returns:
             A list of dictionaries describing the results.
         """
-        connection = sqlite3.connect(self.database_path)
-
-        def dict_factory(cursor, row):
-            """Factory function to convert rows to dictionaries."""
-            fields = [column[0] for column in cursor.description]
-            return dict(zip(fields, row))
+        if property_number in self._search_results:
+            return self._search_results[property_number]
 
-        connection.row_factory = dict_factory
-
-        cursor = connection.execute(
+        cursor = self._connection.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute(
             """
-            SELECT * FROM properties
+            SELECT property_number, report_date, tax_year FROM properties
             JOIN reports ON properties.report_id = reports.rowid
             WHERE property_number = ?
             """,
             (property_number,)
         )
-        return cursor.fetchall()
+        self._search_results[property_number] = [dict(row) for row in cursor]
+        return self._search_results[property_number]
@@ -4,22 +4,30 @@ import re
 import time
 from dataclasses import dataclass
 import subprocess
-import os
 import difflib
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 import uiautomation
 from uiautomation import Keys, WindowVisualState
 
+# Matches a Danish address: street, number, floor, door, zip, city
+_ADDRESS_PATTERN = re.compile(r"^([^,]+?) (\d{1,3}[a-zA-Z]?)(?:, )?(\w+)?\.? ?(\w+?)?, (\d{4}) (.+)$")
 
-@dataclass
+# Matches the status of frozen debt sent to 'Indfrielse', e.g. 'Indfrielse pr. 01.02.2024'
+_INDFRIELSE_PATTERN = re.compile(r"Indfrielse pr. (\d{2})\.(\d{2})\.(\d{4})")
+
+# Converts amounts like "1.234,56" to "1234.56" for float parsing
+_AMOUNT_TABLE = str.maketrans({".": "", ",": "."})
+
+
+@dataclass(slots=True)
 class Property:
     """A dataclass representing a property."""
     property_number: str
     location: str
 
 
-@dataclass
+@dataclass(slots=True)
 class FrozenDebt:
     """A dataclass representing frozen debt."""
     cpr: str
@@ -45,9 +53,7 @@ def find_property(address: str) -> list[Property]:
     """
     street, number, floor, door, _, _ = _deconstruct_address(address)
 
-    structura = uiautomation.WindowControl(RegexName="KMD", AutomationId="MainForm", searchDepth=1)
-    structura.ButtonControl(Name="ESR", searchDepth=6).GetInvokePattern().Invoke()
-    structura.ButtonControl(Name="Ny Søgning", searchDepth=2).GetInvokePattern().Invoke()
+    structura = _new_search("ESR", "Ny Søgning")
 
     search_view = structura.PaneControl(AutomationId="SoegningView", searchDepth=7)
 
@@ -73,11 +79,12 @@ def find_property(address: str) -> list[Property]:
 
     # Get results
     result = []
+    address_pattern = re.compile(fr"{re.escape(street)} {re.escape(number)}[ ,.]*?{floor.upper()}[ ,.]*?{door.upper()},[\w ]*?,")
 
     tree = structura.TreeControl(AutomationId="treeView", searchDepth=6).TreeItemControl(1, 0.5)
     children: list[uiautomation.TreeItemControl] = tree.GetChildren()
     for c in children:
-        if _match_address_result(address, c.Name):
+        if _match_address_result(address_pattern, c.Name):
             c.GetSelectionItemPattern().Select()
             info_pane = structura.PaneControl(AutomationId="rightPanel", searchDepth=6).PaneControl(AutomationId="groupBoxGenerelleOplysninger", searchDepth=4)
             property_number = info_pane.EditControl(AutomationId="textBoxEjendomsnummer").GetValuePattern().Value
@@ -90,7 +97,7 @@ def find_property(address: str) -> list[Property]:
     return result
 
 
-def _deconstruct_address(address: str) -> tuple[str | None, ...]:
+def _deconstruct_address(address: str) -> tuple[str, ...]:
     """Deconstruct an address string to its parts.
     street, number, floor, door, zip, city
 
@@ -99,17 +106,18 @@ def _deconstruct_address(address: str) -> tuple[str | None, ...]:
 
     Returns:
         A tuple of the parts: street, number, floor, door, zip, city.
+        Missing parts are empty strings.
     """
-    matches = re.match(r"^(.+?) (\d{1,3}[a-zA-Z]?)(?:, )?(\w+)?\.? ?(\w+?)?, (\d{4}) (.+)$", address)
-    return matches.groups()
+    matches = _ADDRESS_PATTERN.match(address)
+    return matches.groups(default="")
 
 
-def _match_address_result(address: str, result: str) -> bool:
-    """Match an address string against a result string from Structura.
+def _match_address_result(address_pattern: re.Pattern, result: str) -> bool:
+    """Match an address pattern against a result string from Structura.
     If the result string contains 'Udgået' False is returned.
 
     Args:
-        address: The address string to match.
+        address_pattern: The compiled pattern of the address to match.
         result: The result string to match.
 
     Returns:
@@ -118,10 +126,9 @@ def _match_address_result(address: str, result: str) -> bool:
     if "Udgået" in result:
         return False
 
-    street, number, floor, door, _, _ = _deconstruct_address(address)
-    regex_pattern = fr"{street} {number}[ ,.]*?{floor.upper() if floor else ''}[ ,.]*?{door.upper() if door else ''},[\w ]*?,"
-    matches = re.findall(regex_pattern, result)
-    return len(matches) == 1
+    # The address must occur exactly once in the result
+    match = address_pattern.search(result)
+    return match is not None and address_pattern.search(result, match.end()) is None
 
 
 def get_owners(property_number: str, owners: list[str]) -> list[tuple[str, str]]:
@@ -178,10 +185,7 @@ def get_frozen_debt(property_number: str, owner_cprs: list[str]) -> list[FrozenD
     Returns:
         A list of FrozenDebt objects.
     """
-    # New search
-    structura = uiautomation.WindowControl(RegexName="KMD", AutomationId="MainForm", searchDepth=1)
-    structura.ButtonControl(Name="I-lån", searchDepth=6).GetInvokePattern().Invoke()
-    structura.ButtonControl(Name="Søgning...", searchDepth=2).GetInvokePattern().Invoke()
+    structura = _new_search("I-lån", "Søgning...")
 
     # Search
     ejendom_group = structura.GroupControl(AutomationId="groupBoxEjendom")
@@ -237,16 +241,14 @@ def should_skip_due_to_frozen_debt(frozen_debt_list: list[FrozenDebt]) -> bool:
     Returns:
         True if the task should be skipped for now.
     """
-    today = datetime.today()
-    three_days_ago = today - timedelta(days=3)
-    pattern = re.compile(r"Indfrielse pr. (\d{2}\.\d{2}\.\d{4})")
+    three_days_ago = date.today() - timedelta(days=3)
 
     for frozen_debt in frozen_debt_list:
-        re_match = pattern.match(frozen_debt.status)
+        re_match = _INDFRIELSE_PATTERN.match(frozen_debt.status)
 
         if re_match:
-            date_string = re_match.group(1)
-            indfrielse_date = datetime.strptime(date_string, "%d.%m.%Y")
+            day, month, year = re_match.groups()
+            indfrielse_date = date(int(year), int(month), int(day))
             if three_days_ago < indfrielse_date:
                 return True
 
@@ -294,10 +296,7 @@ def get_tax_data(property_number: str) -> list[tuple[str, str]]:
         data.append((text, amount))
 
     # Calculate sum
-    total = 0
-    for _, amount in data:
-        total += float(amount.replace(".", "").replace(",", "."))
-    total = round(total, 2)
+    total = round(sum(float(amount.translate(_AMOUNT_TABLE)) for _, amount in data), 2)
     data.append(("Sum", f"{total:.2f}".replace(".", ",")))
 
     return data
@@ -305,10 +304,7 @@ def get_tax_data(property_number: str) -> list[tuple[str, str]]:
 
 def _search_property(property_number: str):
     """Search for a property and click 'Hent alle oplysninger'."""
-    # New search
-    structura = uiautomation.WindowControl(RegexName="KMD", AutomationId="MainForm", searchDepth=1)
-    structura.ButtonControl(Name="ESR", searchDepth=6).GetInvokePattern().Invoke()
-    structura.ButtonControl(Name="Ny Søgning", searchDepth=2).GetInvokePattern().Invoke()
+    structura = _new_search("ESR", "Ny Søgning")
 
     # Search
     search_view = structura.PaneControl(AutomationId="SoegningView", searchDepth=7)
@@ -322,6 +318,22 @@ def _search_property(property_number: str):
     structura.ButtonControl(Name="Hent alle oplysninger", searchDepth=2).GetInvokePattern().Invoke()
 
 
+def _new_search(module: str, search_button: str) -> uiautomation.WindowControl:
+    """Open a module in Structura and start a new search in it.
+
+    Args:
+        module: The name of the module button, e.g. 'ESR'.
+        search_button: The name of the button starting a new search in the module.
+
+    Returns:
+        The Structura main window.
+    """
+    structura = uiautomation.WindowControl(RegexName="KMD", AutomationId="MainForm", searchDepth=1)
+    structura.ButtonControl(Name=module, searchDepth=6).GetInvokePattern().Invoke()
+    structura.ButtonControl(Name=search_button, searchDepth=2).GetInvokePattern().Invoke()
+    return structura
+
+
 def open_structura(username: str, password: str):
     """Open and login in to KMD Structura.
 
@@ -330,7 +342,7 @@ def open_structura(username: str, password: str):
         password: The password to use.
 
     Raises:
-        RuntimeError: If KMD Structura failed to maximize.
+        RuntimeError: If KMD Structura didn't open or failed to maximize.
     """
     subprocess.Popen(r"C:\Program Files (x86)\KMD\KMD.JO.Structura\KMD.JO.Structura.exe", cwd=r"C:\Program Files (x86)\KMD\KMD.JO.Structura")  # pylint: disable=consider-using-with
 
@@ -351,20 +363,28 @@ def open_structura(username: str, password: str):
     select_window.ButtonControl(AutomationId="_buttonOK").GetInvokePattern().Invoke()
 
     structura = uiautomation.WindowControl(RegexName="KMD", AutomationId="MainForm", searchDepth=1)
-    # Try maximizing the window a few times until it succeeds
-    for _ in range(10):
-        time.sleep(1)
+    if not structura.Exists(maxSearchSeconds=10, searchIntervalSeconds=0.1):
+        raise RuntimeError("Couldn't find Structura")
+
+    # Try maximizing the window for up to 10 seconds until it succeeds
+    deadline = time.monotonic() + 10
+    while True:
         try:
-            if not structura.GetWindowPattern().SetWindowVisualState(WindowVisualState.Maximized):
-                continue
-            break
+            if structura.GetWindowPattern().SetWindowVisualState(WindowVisualState.Maximized):
+                break
         except Exception:  # pylint: disable=broad-exception-caught
             pass
-    else:
-        raise RuntimeError("Couldn't maximize Structura")
+
+        if time.monotonic() > deadline:
+            raise RuntimeError("Couldn't maximize Structura")
+        time.sleep(0.1)
 
 
 def kill_structura():
     """Kill KMD Logon and KMD Structura."""
-    os.system("taskkill /f /im KMD.JO.Structura.exe")
-    os.system("taskkill /f /im KMD.YH.Security.Logon.Desktop.exe")
+    processes = [
+        subprocess.Popen(["taskkill", "/f", "/im", image_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)  # pylint: disable=consider-using-with
+        for image_name in ("KMD.JO.Structura.exe", "KMD.YH.Security.Logon.Desktop.exe")
+    ]
+    for process in processes:
+        process.wait()
@@ -0,0 +1,24 @@
+"""Tests for the GO session setup."""
+
+import unittest
+
+from robot_framework.sub_process import go_process
+
+
+class TestCreateSession(unittest.TestCase):
+    """Test the retry configuration of the GO session."""
+
+    def test_only_connection_errors_are_retried(self):
+        """Test that only connection errors are retried since GO requests aren't idempotent."""
+        session = go_process.create_session("username", "password")
+        retry = session.get_adapter("https://").max_retries
+
+        self.assertEqual(retry.total, 3)
+        self.assertEqual(retry.connect, 3)
+        self.assertFalse(retry.read)
+        self.assertFalse(retry.status)
+        self.assertEqual(retry.other, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+"""Tests for the address handling in the Structura process."""
+
+import unittest
+
+from robot_framework.sub_process import structura_process
+
+
+class TestDeconstructAddress(unittest.TestCase):
+    """Test deconstructing addresses to their parts."""
+
+    def test_address_with_floor_and_door(self):
+        """Test an address with all parts."""
+        parts = structura_process._deconstruct_address("Testvej 5, 2. th, 8000 Aarhus C")  # pylint: disable=protected-access
+        self.assertEqual(parts, ("Testvej", "5", "2", "th", "8000", "Aarhus C"))
+
+    def test_city_with_comma(self):
+        """Test that everything after the zip code is read as the city."""
+        parts = structura_process._deconstruct_address("Testvej 5, 8000 Aarhus C, Danmark")  # pylint: disable=protected-access
+        self.assertEqual(parts, ("Testvej", "5", "", "", "8000", "Aarhus C, Danmark"))
+
+
+if __name__ == '__main__':
+    unittest.main()